@@ -0,0 +1,8 @@
+
+from .core import HealthInfo, normalize_disease, parse_queries, sanitize_info
+from .prompts import SYSTEM_INSTRUCTIONS, USER_TEMPLATE, SYSTEM_PROMPT, build_user_prompt, build_batch_prompt
+
+__all__ = [
+    "HealthInfo", "normalize_disease", "parse_queries", "sanitize_info",
+    "SYSTEM_INSTRUCTIONS", "USER_TEMPLATE", "SYSTEM_PROMPT", "build_user_prompt", "build_batch_prompt",
+]
@@ -0,0 +1,185 @@
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from openai import AsyncOpenAI, APIStatusError, APIConnectionError, APITimeoutError
+
+from .config import MODEL_NAME, STREAM_REFRESH_EVERY, MAX_ATTEMPTS, MAX_TOKENS_PER_DISEASE, MAX_OUTPUT_TOKENS, BATCH_SIZE, RETRYABLE_STATUS, MAX_WORKERS, api_key
+from .core import StreamedObject, fast_load_json, safe_load_json, sanitize_info, backoff_delay
+from .prompts import SYSTEM_PROMPT, build_user_prompt, build_batch_prompt
+
+
+def is_retryable(ex: Exception) -> bool:
+    if isinstance(ex, APIStatusError):
+        return ex.status_code in RETRYABLE_STATUS or ex.status_code >= 500
+    return isinstance(ex, (APIConnectionError, APITimeoutError))
+
+INVALID_JSON = "Invalid JSON from model"
+TRUNCATED = "Truncated response: the model hit max_tokens"
+BAD_SHAPE = "Unexpected batch shape from model"
+# Το API απάντησε αλλά το περιεχόμενο δεν αξιοποιείται· μόνο τότε έχει νόημα fallback ανά ασθένεια.
+CONTENT_ERRORS = frozenset({INVALID_JSON, TRUNCATED, BAD_SHAPE})
+
+Preview = Callable[[Any, str, Any], None]
+
+def show_preview(preview: Preview, box: Any, fields: List[Tuple[str, Any]]) -> Optional[Any]:
+    """
+    Το preview είναι best-effort: ένα σφάλμα στο rendering δεν πρέπει να φτάσει στο retry
+    του request_json (θα ξαναπληρώναμε το ίδιο request). Επιστρέφει None για να σταματήσει.
+    """
+    try:
+        for key, value in fields:
+            preview(box, key, value)
+    except Exception:
+        return None
+    return box
+
+async def request_json(
+    aclient: AsyncOpenAI,
+    messages: List[Dict[str, str]],
+    placeholder: Optional[Any] = None,
+    preview: Optional[Preview] = None,
+    max_tokens: int = MAX_TOKENS_PER_DISEASE,
+) -> tuple[bool, dict, str]:
+    """
+    Χρήση Chat Completions API με forced JSON και stream=True.
+    Τα deltas μαζεύονται σε λίστα και (αν δοθεί placeholder) εμφανίζονται προοδευτικά:
+    με preview, κάθε top-level πεδίο αποδίδεται μόλις κλείσει· αλλιώς δείχνουμε το raw JSON.
+    Επιστρέφει (ok, parsed_json, raw_or_error), χωρίς sanitize.
+    """
+    last = ""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            stream = await aclient.chat.completions.create(
+                model=MODEL_NAME,
+                response_format={"type": "json_object"},
+                temperature=0.1,
+                max_tokens=max_tokens,
+                timeout=40,
+                stream=True,
+                messages=messages,
+            )
+            parts: List[str] = []
+            data: Dict[str, Any] = {}
+            fields = StreamedObject()
+            box = placeholder.container() if placeholder is not None and preview is not None else None
+            n = 0
+            finish = None
+            async for chunk in stream:
+                n += 1
+                if not chunk.choices:
+                    continue
+                finish = chunk.choices[0].finish_reason or finish
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                # Δοκιμάζουμε parse μόνο όταν το chunk κλείνει object, όχι σε κάθε delta.
+                if delta.rstrip().endswith("}"):
+                    parsed = fast_load_json("".join(parts))
+                    if parsed:
+                        data = parsed
+                        break
+                if box is not None:
+                    box = show_preview(preview, box, fields.feed(delta))
+                elif placeholder is not None and n % STREAM_REFRESH_EVERY == 0:
+                    placeholder.code("".join(parts), language="json")
+            await stream.close()
+            raw = "".join(parts)
+            if not data and finish == "length":
+                # Κομμένη απάντηση: ούτε lenient parse (θα έβρισκε nested object) ούτε retry,
+                # γιατί το ίδιο request θα κοπεί ξανά στο ίδιο σημείο.
+                return False, {}, TRUNCATED
+            if not data:
+                data = safe_load_json(raw)
+            if data:
+                return True, data, raw
+            last = INVALID_JSON
+        except Exception as ex:
+            last = f"{type(ex).__name__}: {ex}"
+            if not is_retryable(ex):
+                break
+            if attempt < MAX_ATTEMPTS:
+                await asyncio.sleep(backoff_delay(attempt))
+    return False, {}, last
+
+async def call_openai(aclient: AsyncOpenAI, disease: str, placeholder: Optional[Any] = None, preview: Optional[Preview] = None) -> tuple[bool, dict, str]:
+    """
+    Μία ασθένεια ανά request.
+    Επιστρέφει (ok, data, raw_or_error).
+    """
+    ok, data, raw = await request_json(aclient, [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_user_prompt(disease)},
+    ], placeholder, preview)
+    if not ok:
+        return False, {}, raw
+    return True, sanitize_info(data), raw
+
+async def call_openai_batch(aclient: AsyncOpenAI, diseases: List[str], placeholder: Optional[Any] = None) -> tuple[bool, List[dict], str]:
+    """
+    Πολλές ασθένειες σε ένα request: το μοντέλο επιστρέφει {"results": [...]} με την ίδια σειρά.
+    Επιστρέφει (ok, [data ανά ασθένεια], raw_or_error).
+    """
+    ok, data, raw = await request_json(aclient, [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_batch_prompt(diseases)},
+    ], placeholder, max_tokens=min(MAX_TOKENS_PER_DISEASE * len(diseases), MAX_OUTPUT_TOKENS))
+    if not ok:
+        return False, [], raw
+    items = data.get("results")
+    if not isinstance(items, list) or len(items) != len(diseases):
+        return False, [], BAD_SHAPE
+    return True, [sanitize_info(item) for item in items], raw
+
+async def call_openai_parallel(aclient: AsyncOpenAI, diseases: List[str], status: Optional[Any] = None) -> Dict[str, tuple[bool, dict, str]]:
+    """
+    Ένα call_openai ανά ασθένεια, ταυτόχρονα στο ίδιο event loop (έως MAX_WORKERS μαζί).
+    Χωρίς streaming· μόνο το status ενημερώνεται καθώς ολοκληρώνονται.
+    """
+    limit = asyncio.Semaphore(MAX_WORKERS)
+
+    async def one(d: str) -> tuple[str, tuple[bool, dict, str]]:
+        async with limit:
+            return d, await call_openai(aclient, d)
+
+    results: Dict[str, tuple[bool, dict, str]] = {}
+    for fut in asyncio.as_completed([one(d) for d in diseases]):
+        d, result = await fut
+        results[d] = result
+        if status is not None:
+            status.update(label=f"{len(results)}/{len(diseases)} — {d}")
+    return results
+
+async def fetch_one(disease: str, placeholder: Optional[Any] = None, preview: Optional[Preview] = None) -> tuple[bool, dict, str]:
+    async with AsyncOpenAI(api_key=api_key()) as aclient:
+        return await call_openai(aclient, disease, placeholder, preview)
+
+async def fetch_many(diseases: List[str], placeholder: Optional[Any] = None) -> Dict[str, tuple[bool, dict, str]]:
+    """
+    Οι ασθένειες σε call_openai_batch των BATCH_SIZE, ώστε το max_tokens να χωράει στο
+    MAX_OUTPUT_TOKENS του μοντέλου· ό,τι δεν επιστρέψει ένα batch ξαναζητείται με
+    call_openai_parallel, με τον ίδιο client.
+    Αν το ίδιο το API απέτυχε (status, transport), δεν κάνουμε fan-out ούτε επόμενα batches:
+    ίδιο σφάλμα για όσες απομένουν.
+    """
+    async with AsyncOpenAI(api_key=api_key()) as aclient:
+        results: Dict[str, tuple[bool, dict, str]] = {}
+        pending: List[str] = []
+        for start in range(0, len(diseases), BATCH_SIZE):
+            group = diseases[start:start + BATCH_SIZE]
+            ok, items, raw = await call_openai_batch(aclient, group, placeholder)
+            if not ok and raw not in CONTENT_ERRORS:
+                results.update((d, (False, {}, raw)) for d in pending + diseases[start:])
+                pending = []
+                break
+            for i, d in enumerate(group):
+                if ok and items[i]:
+                    results[d] = (True, items[i], orjson.dumps(items[i]).decode())
+                else:
+                    pending.append(d)
+        if pending:
+            status = placeholder.status("Ξεχωριστά requests ανά ασθένεια…") if placeholder is not None else None
+            results.update(await call_openai_parallel(aclient, pending, status))
+        return results
@@ -0,0 +1,110 @@
+
+import time, asyncio, hashlib, sqlite3, threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple, Optional
+
+import streamlit as st
+import orjson
+
+from .config import MODEL_NAME, CACHE_VERSION, CACHE_TTL, CACHE_MAX_ENTRIES, CACHE_DB_PATH, PERSIST_TTL
+from .api import Preview, fetch_one, fetch_many
+
+
+@st.cache_resource(show_spinner=False)
+def _response_cache() -> "OrderedDict[str, Tuple[float, tuple]]":
+    return OrderedDict()
+
+_MEMO_LOCK = threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _cache_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(CACHE_DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS info (k TEXT PRIMARY KEY, v TEXT, ts REAL)")
+    conn.execute("DELETE FROM info WHERE ts <= ?", (time.time() - PERSIST_TTL,))
+    return conn
+
+def cache_key(disease: str, model: str = MODEL_NAME) -> str:
+    return hashlib.blake2b(f"{CACHE_VERSION}|{model}|{disease}".encode("utf-8"), digest_size=16).hexdigest()
+
+def db_get(key: str, ttl: float = PERSIST_TTL) -> Optional[str]:
+    row = _cache_db().execute("SELECT v FROM info WHERE k = ? AND ts > ?", (key, time.time() - ttl)).fetchone()
+    return row[0] if row else None
+
+def db_put(key: str, value: str) -> None:
+    _cache_db().execute("INSERT OR REPLACE INTO info (k, v, ts) VALUES (?, ?, ?)", (key, value, time.time()))
+
+def memo_put(key: str, result: tuple[bool, dict, str]) -> None:
+    """
+    Το memo είναι κοινό για όλα τα sessions: τα entries μένουν σε σειρά εισαγωγής,
+    οπότε τα ληγμένα βγαίνουν από την αρχή και το μέγεθος μένει έως CACHE_MAX_ENTRIES.
+    """
+    cache = _response_cache()
+    now = time.time()
+    with _MEMO_LOCK:
+        cache[key] = (now, result)
+        cache.move_to_end(key)
+        while cache:
+            ts, _ = next(iter(cache.values()))
+            if now - ts < CACHE_TTL and len(cache) <= CACHE_MAX_ENTRIES:
+                break
+            cache.popitem(last=False)
+
+def cache_get(disease: str) -> Optional[tuple[bool, dict, str]]:
+    key = cache_key(disease)
+    hit = _response_cache().get(key)
+    if hit and time.time() - hit[0] < CACHE_TTL:
+        return hit[1]
+    blob = db_get(key)
+    if blob is not None:
+        try:
+            data = orjson.loads(blob)
+        except orjson.JSONDecodeError:
+            return None
+        result = (True, data, blob)
+        memo_put(key, result)
+        return result
+    return None
+
+def cache_put(disease: str, result: tuple[bool, dict, str]) -> None:
+    key = cache_key(disease)
+    memo_put(key, result)
+    db_put(key, orjson.dumps(result[1]).decode())
+
+def cached_call_openai(disease: str, placeholder: Optional[Any] = None, preview: Optional[Preview] = None) -> tuple[bool, dict, str]:
+    """
+    Δύο επίπεδα cache μπροστά από το call_openai:
+    in-memory (ttl CACHE_TTL) και SQLite στο CACHE_DB_PATH (ttl PERSIST_TTL) που επιβιώνει restarts.
+    Το st.cache_data δεν επιτρέπει γράψιμο σε placeholder που φτιάχτηκε εκτός της συνάρτησης,
+    οπότε το streaming μένει έξω από το cache και κρατάμε μόνο τις επιτυχίες.
+    Sync wrapper: το async κομμάτι τρέχει με asyncio.run και δικό του AsyncOpenAI client ανά κλήση,
+    γιατί οι συνδέσεις του httpx δεν μεταφέρονται από ένα event loop σε άλλο.
+    """
+    hit = cache_get(disease)
+    if hit is not None:
+        return hit
+    result = asyncio.run(fetch_one(disease, placeholder, preview))
+    if result[0]:
+        cache_put(disease, result)
+    return result
+
+def cached_call_openai_batch(diseases: List[str], placeholder: Optional[Any] = None, preview: Optional[Preview] = None) -> Dict[str, tuple[bool, dict, str]]:
+    """
+    Όπως το cached_call_openai, για πολλές ασθένειες: τα hits έρχονται από το cache
+    και όλα τα misses ζητούνται μαζί με το fetch_many.
+    """
+    results: Dict[str, tuple[bool, dict, str]] = {}
+    misses: List[str] = []
+    for d in diseases:
+        hit = cache_get(d)
+        if hit is None:
+            misses.append(d)
+        else:
+            results[d] = hit
+    if len(misses) == 1:
+        results[misses[0]] = cached_call_openai(misses[0], placeholder, preview)
+    elif misses:
+        for d, result in asyncio.run(fetch_many(misses, placeholder)).items():
+            if result[0]:
+                cache_put(d, result)
+            results[d] = result
+    return results
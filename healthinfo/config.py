@@ -0,0 +1,24 @@
+
+import os
+from typing import Optional
+
+import streamlit as st
+
+
+MODEL_NAME = "gpt-4.1-mini"  
+STREAM_REFRESH_EVERY = 8
+CACHE_TTL = 600
+CACHE_MAX_ENTRIES = 256
+CACHE_DB_PATH = "cache.db"
+CACHE_VERSION = 2
+PERSIST_TTL = 7 * 24 * 3600
+MAX_ATTEMPTS = 3
+MAX_TOKENS_PER_DISEASE = 900
+MAX_OUTPUT_TOKENS = 32768
+BATCH_SIZE = MAX_OUTPUT_TOKENS // MAX_TOKENS_PER_DISEASE
+RETRYABLE_STATUS = {408, 409, 429}
+MAX_WORKERS = 8
+
+
+def api_key() -> Optional[str]:
+    return st.secrets.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
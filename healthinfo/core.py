@@ -0,0 +1,265 @@
+
+import re, json, math, random
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TypedDict
+
+import orjson
+
+
+_JSON_DECODER = json.JSONDecoder()
+_PUNCT_RE = re.compile(r"[^\w\s-]+")
+_WS_RE = re.compile(r"\s+")
+_SPACE_RE = re.compile(r"\s*")
+_SEP_RE = re.compile(r"[\s,]*")
+_STRUCT_RE = re.compile(r'[{}"\\]')
+_INT_RE = re.compile(r"[-+]?\d[\d,]*(?:\.\d*)?")
+_FLT_RE = re.compile(r"[-+]?(?:\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE][-+]?\d+)?")
+_PCT_TRANS = str.maketrans({"%": None, ",": ".", " ": None})
+
+
+class Stats(TypedDict):
+    total_cases: int
+    incidence_per_100k: float
+    recovery_rate: str
+    mortality_rate: str
+    recovery_rate_pct: float
+    mortality_rate_pct: float
+
+class Region(TypedDict):
+    region: str
+    cases: int
+    deaths: int
+
+class Medication(TypedDict):
+    name: str
+    dosage: str
+    side_effects: List[str]
+
+class HealthInfo(TypedDict, total=False):
+    name: str
+    summary: str
+    statistics: Stats
+    region_breakdown: List[Region]
+    recovery_options: Dict[str, str]
+    medications: List[Medication]
+    disclaimer: str
+
+
+class StreamedObject:
+    """
+    Incremental parse ενός top-level JSON object που έρχεται σε κομμάτια.
+    Το feed() επιστρέφει τα (key, value) που μόλις ολοκληρώθηκαν. Κάθε value γίνεται
+    raw_decode μία φορά, μόνο όταν ακολουθεί "," ή "}"· κρατάμε μόνο το ακατανάλωτο υπόλοιπο.
+    """
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+        self._opened = False
+        self.done = False
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        self._parts.append(delta)
+        if self.done or ("," not in delta and "}" not in delta):
+            return []
+        text = "".join(self._parts)
+        i = 0
+        if not self._opened:
+            i = text.find("{")
+            if i == -1:
+                return []
+            i += 1
+            self._opened = True
+        fields: List[Tuple[str, Any]] = []
+        while True:
+            start = _SEP_RE.match(text, i).end()
+            if start < len(text) and text[start] == "}":
+                self.done = True
+                i = start + 1
+                break
+            try:
+                key, j = _JSON_DECODER.raw_decode(text, start)
+                j = _SPACE_RE.match(text, j).end()
+                if not isinstance(key, str) or text[j:j + 1] != ":":
+                    break
+                value, end = _JSON_DECODER.raw_decode(text, _SPACE_RE.match(text, j + 1).end())
+            except json.JSONDecodeError:
+                break
+            # Ολοκληρωμένο μόνο αν ακολουθεί "," ή "}": το "-500." γίνεται decode ως -500.
+            nxt = _SPACE_RE.match(text, end).end()
+            if text[nxt:nxt + 1] not in (",", "}"):
+                break
+            fields.append((key, value))
+            i = end
+        self._parts = [text[i:]]
+        return fields
+
+
+def normalize_disease(s: str) -> str:
+    return _WS_RE.sub(" ", _PUNCT_RE.sub(" ", s.lower())).strip()
+
+def parse_queries(text: str) -> Dict[str, str]:
+    """
+    Μία ασθένεια ανά γραμμή: normalized query -> το κείμενο όπως γράφτηκε, χωρίς διπλότυπα.
+    """
+    queries: Dict[str, str] = {}
+    for line in text.splitlines():
+        q = normalize_disease(line)
+        if q:
+            queries.setdefault(q, line.strip())
+    return queries
+
+@lru_cache(maxsize=256)
+def _coerce_pct_str(t: str) -> float:
+    try:
+        return float(t.translate(_PCT_TRANS))
+    except ValueError:
+        return 0.0
+
+def coerce_pct(s: Any) -> float:
+    if isinstance(s, (int, float)):
+        return float(s)
+    if not s:
+        return 0.0
+    return _coerce_pct_str(str(s))
+
+def _object_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Τα balanced top-level {...} του text, σε ένα πέρασμα. Ένα "{" που δεν κλείνει ποτέ
+    (π.χ. απάντηση κομμένη στο max_tokens) δεν δίνει span: δεν ψάχνουμε nested objects μέσα του.
+    """
+    depth, start, in_str, escaped_at = 0, -1, False, -1
+    for m in _STRUCT_RE.finditer(text):
+        i = m.start()
+        if i == escaped_at:
+            continue
+        ch = text[i]
+        if ch == "\\":
+            if in_str:
+                escaped_at = i + 1
+        elif ch == '"':
+            if depth:
+                in_str = not in_str
+        elif in_str:
+            continue
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                yield start, i + 1
+
+def extract_json_block(text: str) -> Dict[str, Any]:
+    if not isinstance(text, str) or "{" not in text:
+        return {}
+    for start, end in _object_spans(text):
+        try:
+            return orjson.loads(text[start:end])
+        except orjson.JSONDecodeError:
+            continue
+    return {}
+
+def fast_load_json(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def safe_load_json(text: Any) -> Dict[str, Any]:
+    if isinstance(text, dict):
+        return text
+    if not isinstance(text, str):
+        return {}
+    return fast_load_json(text) or extract_json_block(text)
+
+@lru_cache(maxsize=256)
+def format_metrics(recovery_rate: str, mortality_rate: str, total_cases: int, incidence: Any) -> Tuple[Tuple[str, str], ...]:
+    return (
+        ("Recovery rate", recovery_rate),
+        ("Mortality rate", mortality_rate),
+        ("Total cases", f"{total_cases:,}"),
+        ("Incidence / 100k", str(incidence)),
+    )
+
+@lru_cache(maxsize=256)
+def _ensure_pct_str(t: str) -> str:
+    t = t.strip()
+    if not t:
+        return "0%"
+    try:
+        float(t.translate(_PCT_TRANS))
+        return t if t.endswith("%") else t + "%"
+    except ValueError:
+        return t
+
+def ensure_pct_str(s: Any) -> str:
+    if s is None:
+        return "0%"
+    return _ensure_pct_str(str(s))
+
+def _to_int(x: Any, default: int = 0) -> int:
+    if isinstance(x, int):
+        return int(x)
+    if isinstance(x, float):
+        return int(x) if math.isfinite(x) else default
+    s = str(x).strip()
+    if _INT_RE.fullmatch(s):
+        return int(s.replace(",", "").split(".")[0])
+    return default
+
+def _to_float(x: Any, default: float = 0.0) -> float:
+    if isinstance(x, (int, float)):
+        return float(x)
+    s = str(x).strip()
+    if _FLT_RE.fullmatch(s):
+        return float(s.replace(",", "."))
+    return default
+
+def _to_str(x: Any) -> str:
+    return str(x) if x else ""
+
+def _to_str_list(x: Any) -> List[str]:
+    return [str(s) for s in x if s] if isinstance(x, list) else []
+
+def sanitize_info(info: Any) -> HealthInfo:
+    if not isinstance(info, dict):
+        return {}
+    stats = info.get("statistics")
+    if not isinstance(stats, dict):
+        stats = {}
+    regions = info.get("region_breakdown")
+    meds = info.get("medications")
+    ropts = info.get("recovery_options")
+    rec = ensure_pct_str(stats.get("recovery_rate", "0%"))
+    mort = ensure_pct_str(stats.get("mortality_rate", "0%"))
+    return {
+        "name": _to_str(info.get("name")),
+        "summary": _to_str(info.get("summary")),
+        "statistics": {
+            "total_cases": _to_int(stats.get("total_cases")),
+            "incidence_per_100k": _to_float(stats.get("incidence_per_100k")),
+            "recovery_rate": rec,
+            "mortality_rate": mort,
+            "recovery_rate_pct": coerce_pct(rec),
+            "mortality_rate_pct": coerce_pct(mort),
+        },
+        "region_breakdown": [
+            {"region": _to_str(r.get("region")), "cases": _to_int(r.get("cases")), "deaths": _to_int(r.get("deaths"))}
+            for r in regions if isinstance(r, dict)
+        ] if isinstance(regions, list) else [],
+        "recovery_options": {str(k): str(v) for k, v in ropts.items()} if isinstance(ropts, dict) else {},
+        "medications": [
+            {
+                "name": _to_str(m.get("name")),
+                "dosage": _to_str(m.get("dosage")),
+                "side_effects": _to_str_list(m.get("side_effects")),
+            }
+            for m in meds if isinstance(m, dict)
+        ] if isinstance(meds, list) else [],
+        "disclaimer": _to_str(info.get("disclaimer")),
+    }
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 2.0) -> float:
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,70 @@
+
+from typing import List, Final
+
+
+SYSTEM_INSTRUCTIONS: Final = """
+You are a careful medical information formatter. You NEVER give medical advice.
+You ONLY return JSON that fits the schema. If you don't know something, estimate conservatively.
+Percentages must be strings with a percent sign (e.g., "72.4%"). Integers must be integers.
+"""
+
+
+RESPONSE_SCHEMA: Final = """
+{
+  "name": string,
+  "summary": "2-3 plain sentences",
+  "statistics": {
+    "total_cases": integer,
+    "incidence_per_100k": number,
+    "recovery_rate": string,
+    "mortality_rate": string
+  },
+  "region_breakdown": [
+    {"region": string, "cases": integer, "deaths": integer}
+  ],
+  "recovery_options": {
+    "<option_name>": "1-3 plain sentences (no medical advice, general info)"
+  },
+  "medications": [
+    {"name": string, "side_effects": [string, ...], "dosage": string}
+  ],
+  "disclaimer": "This content is educational only and not medical advice."
+}
+"region_breakdown" has exactly 5 items; "recovery_options" has exactly 3 entries; "medications" has exactly 3 items, each with exactly 3 "side_effects".
+"""
+
+
+USER_TEMPLATE: Final = """
+Provide structured, didactic information about the disease named at the end of this message.
+Return STRICT JSON (no prose outside JSON) with the following schema:
+__SCHEMA__
+Rules:
+- Output MUST be valid JSON with double quotes only. No markdown, no backticks, no text outside JSON.
+
+Disease: "__DISEASE__"
+""".replace("__SCHEMA__", RESPONSE_SCHEMA)
+
+
+BATCH_TEMPLATE: Final = """
+Provide structured, didactic information about each disease listed at the end of this message.
+Return STRICT JSON (no prose outside JSON) of the form {"results": [...]}.
+"results" must hold exactly one object per disease, in the same order as listed, each with the following schema:
+__SCHEMA__
+Rules:
+- Output MUST be valid JSON with double quotes only. No markdown, no backticks, no text outside JSON.
+
+Diseases:
+__DISEASES__
+""".replace("__SCHEMA__", RESPONSE_SCHEMA)
+
+SYSTEM_PROMPT: Final = SYSTEM_INSTRUCTIONS.strip()
+_USER_PREFIX, _USER_SUFFIX = USER_TEMPLATE.strip().split("__DISEASE__", 1)
+_BATCH_PREFIX, _BATCH_SUFFIX = BATCH_TEMPLATE.strip().split("__DISEASES__", 1)
+
+
+def build_user_prompt(disease: str) -> str:
+    return _USER_PREFIX + disease + _USER_SUFFIX
+
+def build_batch_prompt(diseases: List[str]) -> str:
+    listing = "\n".join(f'- "{d}"' for d in diseases)
+    return _BATCH_PREFIX + listing + _BATCH_SUFFIX
@@ -0,0 +1,105 @@
+
+from typing import Any, Dict, List
+
+import streamlit as st
+import pandas as pd
+import orjson
+
+from .core import format_metrics, sanitize_info
+
+
+def render_stats(info: Dict[str, Any]):
+    stats = info.get("statistics", {}) or {}
+    metrics = format_metrics(
+        stats.get("recovery_rate", "—"), stats.get("mortality_rate", "—"),
+        stats.get("total_cases", 0), stats.get("incidence_per_100k", "—"),
+    )
+    for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value)
+    df = pd.DataFrame({"Value": [stats.get("recovery_rate_pct", 0.0), stats.get("mortality_rate_pct", 0.0)]}, index=pd.Index(["Recovery", "Mortality"], name="Rate"))
+    st.bar_chart(df)
+
+def render_regions(info: Dict[str, Any]):
+    rows: List[Dict[str, Any]] = info.get("region_breakdown", []) or []
+    if not rows:
+        return
+    st.subheader("Regional breakdown")
+    st.table(rows)
+    st.bar_chart(pd.Series([r["cases"] for r in rows], index=[r["region"] for r in rows], name="cases"))
+
+def render_options(info: Dict[str, Any]):
+    opts: Dict[str, str] = info.get("recovery_options", {}) or {}
+    if not opts:
+        return
+    st.subheader("Recovery options (general info)")
+    for k, v in opts.items():
+        st.markdown(f"**{k}**")
+        st.write(v)
+
+def render_meds(info: Dict[str, Any]):
+    meds: List[Dict[str, Any]] = info.get("medications", []) or []
+    if not meds:
+        return
+    st.subheader("Medications (examples)")
+    for i, m in enumerate(meds, start=1):
+        name = (m or {}).get("name", "—")
+        dose = (m or {}).get("dosage", "—")
+        se = (m or {}).get("side_effects", []) or []
+        st.markdown(f"**{i}. {name}**")
+        st.write(f"Dosage: {dose}")
+        if se:
+            st.write("Side effects:")
+            for s in se:
+                st.write(f"· {s}")
+
+def preview_field(box: Any, key: str, value: Any):
+    with box:
+        if key == "name":
+            st.header(value)
+        elif key == "summary":
+            st.write(value)
+        elif key == "statistics" and isinstance(value, dict):
+            render_stats(sanitize_info({"statistics": value}))
+
+@st.fragment
+def render_result(ok: bool, data: Dict[str, Any], raw: str, fallback_name: str):
+    if ok:
+        try:
+            st.success("ΟΚ — λήψη δεδομένων.")
+            st.header(data.get("name") or fallback_name)
+            if data.get("summary"):
+                st.write(data.get("summary"))
+            render_stats(data)
+            st.divider()
+            c1, c2 = st.columns(2)
+            with c1:
+                render_regions(data)
+            with c2:
+                render_options(data)
+            st.divider()
+            render_meds(data)
+            if data.get("disclaimer"):
+                st.info(data.get("disclaimer"))
+            with st.expander("Raw JSON (debug)"):
+                st.code(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+        except Exception as e:
+            st.error("Σφάλμα κατά την εμφάνιση των δεδομένων.")
+            with st.expander("Debug"):
+                st.write(repr(e))
+                try:
+                    st.code(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+                except Exception:
+                    st.write(data)
+    else:
+        st.error("Αποτυχία κλήσης στο OpenAI.")
+        with st.expander("Debug details"):
+            st.write(raw if isinstance(raw, str) else repr(raw))
+
+def render_results(queries: Dict[str, str], results: Dict[str, tuple[bool, dict, str]]):
+    if len(results) == 1:
+        q, name = next(iter(queries.items()))
+        render_result(*results[q], name)
+    else:
+        for tab, (q, name) in zip(st.tabs(list(queries.values())), queries.items()):
+            with tab:
+                render_result(*results[q], name)
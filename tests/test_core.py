@@ -0,0 +1,118 @@
+
+import json, random
+
+import orjson
+import pytest
+
+from healthinfo.core import StreamedObject, _object_spans, extract_json_block, safe_load_json
+
+
+PAYLOAD = {
+    "name": "Influenza, \"seasonal\" {A/B}",
+    "summary": "Fever, cough } and fatigue; see \\ notes, \u00e9 τέλος.",
+    "statistics": {"total_cases": 1234567, "incidence_per_100k": 12.5, "recovery_rate": "99.9%", "mortality_rate": "0.1%"},
+    "region_breakdown": [{"region": "EU, \"west\"", "cases": 10, "deaths": 1}, {"region": "}{", "cases": 20, "deaths": 2}],
+    "recovery_options": {"rest": "Sleep, fluids}.", "\"quoted\"": ","},
+    "medications": [{"name": "X", "side_effects": ["a,", "b}", "\""], "dosage": "1 mg"}],
+    "disclaimer": "This content is educational only and not medical advice.",
+    "empty": {},
+    "flag": True,
+    "nothing": None,
+    "negative": -0.5e3,
+}
+
+ENCODINGS = [
+    json.dumps(PAYLOAD, ensure_ascii=False),
+    json.dumps(PAYLOAD),
+    json.dumps(PAYLOAD, indent=2) + "\n  \n",
+    orjson.dumps(PAYLOAD, option=orjson.OPT_INDENT_2).decode(),
+    "  \n" + json.dumps(PAYLOAD, separators=(" ,\n ", " :\t")) + "   ",
+]
+
+
+def random_pieces(text, rng, max_size):
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, max_size)
+        yield text[i:i + n]
+        i += n
+
+
+def feed_all(pieces):
+    parser = StreamedObject()
+    fields = []
+    for piece in pieces:
+        fields.extend(parser.feed(piece))
+    return parser, fields
+
+
+def same(fields, expected):
+    return orjson.dumps(fields) == orjson.dumps(expected)
+
+
+@pytest.mark.parametrize("text", ENCODINGS)
+@pytest.mark.parametrize("seed", range(50))
+def test_streamed_object_random_chunks(text, seed):
+    rng = random.Random(seed)
+    parser, fields = feed_all(random_pieces(text, rng, rng.choice([1, 3, 8, 40])))
+    assert same(fields, list(PAYLOAD.items()))
+    assert parser.done
+
+
+@pytest.mark.parametrize("text", ENCODINGS)
+def test_streamed_object_one_char_at_a_time(text):
+    parser, fields = feed_all(text)
+    assert same(fields, list(PAYLOAD.items()))
+    assert parser.done
+
+
+def test_streamed_object_waits_for_value_to_finish():
+    parser = StreamedObject()
+    assert parser.feed('{"a": 12') == []
+    assert parser.feed("34") == []
+    assert parser.feed(", ") == [("a", 1234)]
+    assert parser.feed('"b": "x, }') == []
+    assert parser.feed('"}') == [("b", "x, }")]
+    assert parser.done
+    assert parser.feed(', "c": 1}') == []
+
+
+def test_streamed_object_partial_payload():
+    text = json.dumps(PAYLOAD)
+    cut = text.index('"medications"')
+    parser, fields = feed_all(random_pieces(text[:cut], random.Random(0), 5))
+    assert [k for k, _ in fields] == list(PAYLOAD)[:5]
+    assert not parser.done
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('Sure { here: {"a": 1}', {}),
+    ('x {"a": "}"} y', {"a": "}"}),
+    ('{"q": "\\"{"}', {"q": '"{'}),
+    ('noise {"a": {"b": [1, {"c": 2}]}} {"z": 1}', {"a": {"b": [1, {"c": 2}]}}),
+    ("```json\n" + json.dumps(PAYLOAD, indent=2) + "\n```", PAYLOAD),
+    ("{ {", {}),
+    ('{"a": 1', {}),
+    ("no json here", {}),
+    (None, {}),
+])
+def test_extract_json_block(text, expected):
+    assert extract_json_block(text) == expected
+
+
+def test_object_spans_single_pass():
+    text = 'x {"a": 1} y {"b": "}{"} {'
+    assert [text[s:e] for s, e in _object_spans(text)] == ['{"a": 1}', '{"b": "}{"}']
+
+
+@pytest.mark.parametrize("text", ENCODINGS)
+@pytest.mark.parametrize("cut", [0.2, 0.5, 0.9, 0.99])
+def test_truncated_payload_is_rejected(text, cut):
+    truncated = text.rstrip()[:int(len(text.rstrip()) * cut)]
+    assert extract_json_block(truncated) == {}
+    assert safe_load_json(truncated) == {}
+
+
+@pytest.mark.parametrize("text", ENCODINGS)
+def test_safe_load_json_with_noise(text):
+    assert safe_load_json("Here you go: " + text + " Hope it helps {") == PAYLOAD